@@ -8,20 +8,32 @@ from fastapi import FastAPI, HTTPException, Depends, Request
 from pydantic import BaseModel
 from pathlib import Path
 import os
-import json
+import logging
+import threading
 import requests
 from datetime import datetime
 from typing import List, Dict, Any
 from traffic_monitor.fetcher import GitHubFetcher
-from traffic_monitor.config import load_config
+from traffic_monitor.config import ConfigCache, file_stamp
+from traffic_monitor.leaderboard import (
+    LeaderboardIndex, METRICS as LEADERBOARD_METRICS, WINDOWS as LEADERBOARD_WINDOWS
+)
+from traffic_monitor.notifier import (
+    AnomalyEngine, AnomalyDetector, AlertBatcher, build_sinks_from_env
+)
+from traffic_monitor.compression import (
+    cached_json_response, payload_cache, load_json, dump_json
+)
 from traffic_monitor.security import apply_security, get_api_key
 from traffic_monitor.security_hardening import (
     setup_rate_limiting, enforce_https, limiter, log_admin_action
 )
 
-HISTORY_FILE = os.getenv("TRAFFIC_HISTORY", "traffic_history.json")
+HISTORY_FILE = os.getenv("TRAFFIC_HISTORY", "traffic_history.json")  # .json.gz / .json.zst to compress at rest
 CONFIG_FILE = os.getenv("TRAFFIC_CONFIG", "config.yml")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GITHUB_POOL_SIZE = int(os.getenv("GITHUB_POOL_SIZE", "10"))
+ALERT_COOLDOWN = float(os.getenv("TRAFFIC_ALERT_COOLDOWN", str(6 * 3600)))
 
 app = FastAPI(title="GitHub Traffic Monitor API")
 app = apply_security(app)
@@ -41,16 +53,77 @@ class AnalyzeRequest(BaseModel):
     repoName: str
     repoHistory: List[Dict[str, Any]]
 
+# --- Long-lived config & GitHub client ---
+config_cache = ConfigCache(CONFIG_FILE)
+_fetcher = None
+_fetcher_generation = 0
+_fetcher_lock = threading.Lock()
+
+def get_fetcher() -> GitHubFetcher:
+    """
+    Return the process-wide GitHubFetcher, rebuilding it only when the
+    config file has changed since it was created.
+    """
+    global _fetcher, _fetcher_generation
+    cfg = config_cache.get()
+    with _fetcher_lock:
+        if _fetcher is None or _fetcher_generation != config_cache.generation:
+            if _fetcher is not None:
+                _fetcher.client.close()
+            _fetcher = GitHubFetcher(token=cfg.token, org=cfg.organization, pool_size=GITHUB_POOL_SIZE)
+            _fetcher_generation = config_cache.generation
+        return _fetcher
+
+@app.on_event("startup")
+def warm_github_client():
+    # Build config + client up front; a missing or invalid config is reported on first refresh instead.
+    if Path(CONFIG_FILE).exists():
+        try:
+            get_fetcher()
+        except SystemExit:
+            logging.warning(f"Could not load {CONFIG_FILE} at startup; deferring to first refresh")
+
+# --- Top-N index ---
+leaderboard = LeaderboardIndex()
+_leaderboard_built = False
+_leaderboard_lock = threading.Lock()
+
+def get_leaderboard() -> LeaderboardIndex:
+    """Build the index from stored history on first use; refreshes keep it current."""
+    global _leaderboard_built
+    with _leaderboard_lock:
+        if not _leaderboard_built:
+            leaderboard.build(load_history())
+            _leaderboard_built = True
+    return leaderboard
+
+# --- Anomaly engine ---
+anomaly_engine = AnomalyEngine(
+    AnomalyDetector(), AlertBatcher(build_sinks_from_env(), cooldown=ALERT_COOLDOWN)
+)
+_anomaly_primed = False
+_anomaly_lock = threading.Lock()
+
+def get_anomaly_engine() -> AnomalyEngine:
+    """Warm baselines from stored history on first use; refreshes keep them current."""
+    global _anomaly_primed
+    with _anomaly_lock:
+        if not _anomaly_primed:
+            anomaly_engine.prime(load_history())
+            _anomaly_primed = True
+    return anomaly_engine
+
 # --- Persistence utils ---
+_history_lock = threading.Lock()  # serializes read-modify-write of HISTORY_FILE
+
 def load_history():
     if Path(HISTORY_FILE).exists():
-        with open(HISTORY_FILE, 'r') as f:
-            return json.load(f)
+        return load_json(HISTORY_FILE)
     return []
 
 def save_history(history):
-    with open(HISTORY_FILE, 'w') as f:
-        json.dump(history, f, indent=2)
+    dump_json(HISTORY_FILE, history)
+    payload_cache.invalidate("traffic")
 
 def generate_ai_analysis(repo_name: str, repo_history: List[Dict[str, Any]]) -> str:
     """
@@ -156,24 +229,53 @@ Keep the tone professional but accessible."""
 @limiter.limit("30/minute")
 def get_traffic(request: Request):
     log_admin_action(request, action="get_traffic", extra={})
-    hist = load_history()
-    return {"history": hist}
+    return cached_json_response(
+        request, "traffic", file_stamp(HISTORY_FILE), lambda: {"history": load_history()}
+    )
 
 @app.post("/api/refresh", response_model=dict, dependencies=[Depends(get_api_key)])
 @limiter.limit("10/minute")
 def refresh_traffic(request: Request):
     log_admin_action(request, action="refresh_traffic", extra={})
-    cfg = load_config(CONFIG_FILE)
-    fetcher = GitHubFetcher(token=cfg.token, org=cfg.organization)
+    fetcher = get_fetcher()
     stats = fetcher.fetch_all()
     now = datetime.utcnow().isoformat()
     for s in stats:
         s['timestamp'] = now
-    # Append to history
-    history = load_history()
-    history.extend(stats)
-    save_history(history)
-    return {"added": len(stats), "history_len": len(history)}
+    # Build ingest state from stored history before this batch is appended to it
+    index = get_leaderboard()
+    engine = get_anomaly_engine()
+    # Append to history; concurrent refreshes must not drop each other's batches
+    with _history_lock:
+        history = load_history()
+        history.extend(stats)
+        save_history(history)
+        index.ingest(stats)
+        alerts = engine.ingest(stats)
+    return {"added": len(stats), "history_len": len(history), "alerts": len(alerts)}
+
+@app.get("/api/top", dependencies=[Depends(get_api_key)])
+@limiter.limit("30/minute")
+def top_repos(request: Request, metric: str = "clones_uniques", window: str = "7d", n: int = 20):
+    """
+    Top-N repositories by gain in `metric` over `window`, served from the ingest-time index.
+    """
+    log_admin_action(request, action="top_repos", extra={"metric": metric, "window": window, "n": n})
+    if not 1 <= n <= 1000:
+        raise HTTPException(status_code=400, detail="n must be between 1 and 1000")
+    if metric not in LEADERBOARD_METRICS:
+        raise HTTPException(status_code=400, detail=f"Unknown metric: {metric}")
+    if window not in LEADERBOARD_WINDOWS:
+        raise HTTPException(status_code=400, detail=f"Unknown window: {window}")
+    index = get_leaderboard()
+    # Rows are only computed on a cache miss; the payload cache is LRU-bounded
+    return cached_json_response(
+        request, f"top:{metric}:{window}:{n}", index.version,
+        lambda: {
+            "as_of": index.as_of.isoformat() if index.as_of else None,
+            "top": index.top(metric, window, n),
+        }
+    )
 
 @app.post("/api/analyze", dependencies=[Depends(get_api_key)])
 @limiter.limit("5/minute")
@@ -207,8 +309,11 @@ def health(request: Request):
     # Check if Gemini API key is configured
     gemini_status = "configured" if GEMINI_API_KEY else "not_configured"
     
+    github_pool = _fetcher.connection_stats() if _fetcher is not None else None
+
     return {
         "status": "ok",
         "gemini_api": gemini_status,
+        "github_pool": github_pool,
         "timestamp": datetime.utcnow().isoformat()
     }
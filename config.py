@@ -2,9 +2,11 @@
 
 Configuration loader and validator for GitHub Traffic Monitor.
 Supports YAML and INI files.
+ConfigCache keeps a parsed Config in memory and reloads it only when the file changes.
 '''
 import os
 import sys
+import threading
 from pathlib import Path
 import logging
 
@@ -84,3 +86,49 @@ class Config:
         return (
             f"<Config token=***{'*'*5} org={self.organization or 'user'} out={self.output_dir}>"
         )
+
+
+def file_stamp(path) -> tuple | None:
+    """(mtime_ns, size) of a file, or None if it does not exist; used to detect changes."""
+    try:
+        st = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ConfigCache:
+    """
+    Holds a loaded Config for long-lived processes (e.g. the API).
+    The file is re-parsed only when its mtime or size changes; otherwise the
+    cached Config (and its already-created output_dir) is returned as-is.
+    `generation` increases on every reload so callers can rebuild derived state.
+    If a changed file fails to load, the error is logged and the last good
+    Config keeps being served; only the very first load exits on error.
+    """
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.generation = 0
+        self._config: Config | None = None
+        self._stamp: tuple | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Config:
+        stamp = file_stamp(self.path)
+        with self._lock:
+            if self._config is None:
+                self._config = load_config(str(self.path))
+                self._stamp = stamp
+                self.generation += 1
+            elif stamp != self._stamp:
+                logging.info(f"Config file changed, reloading: {self.path}")
+                # Remember the stamp either way so a broken file is reported once, not per call
+                self._stamp = stamp
+                try:
+                    config = load_config(str(self.path))
+                except (SystemExit, Exception) as e:
+                    logging.error(f"Invalid config in {self.path}, keeping previous config: {e!r}")
+                else:
+                    self._config = config
+                    self.generation += 1
+            return self._config
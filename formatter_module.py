@@ -16,6 +16,7 @@ class Formatter:
 
     Supported formats:
       - table: pretty-printed to stdout
+      - top: leaderboard rows from LeaderboardIndex.top(), pretty-printed to stdout
       - csv: writes file 'traffic_stats.csv' in output_dir
       - json: writes file 'traffic_stats.json' in output_dir
     """
@@ -28,6 +29,8 @@ class Formatter:
         fmt = fmt.lower()
         if fmt == 'table':
             self._print_table()
+        elif fmt == 'top':
+            self._print_top()
         elif fmt == 'csv':
             self._write_csv()
         elif fmt == 'json':
@@ -45,12 +48,23 @@ class Formatter:
         table = tabulate(rows, headers=headers, tablefmt='github')
         print(table)
 
+    def _print_top(self):
+        metric = self.stats[0]['metric'] if self.stats else 'metric'
+        window = self.stats[0]['window'] if self.stats else ''
+        headers = ['#', 'Repo', f'{metric} gain ({window})', metric]
+        rows = [
+            [rank, s['name'], s['gain'], s['value']]
+            for rank, s in enumerate(self.stats, start=1)
+        ]
+        table = tabulate(rows, headers=headers, tablefmt='github')
+        print(table)
+
     def _write_csv(self):
         file_path = self.output_dir / 'traffic_stats.csv'
         headers = ['name', 'views_count', 'views_uniques', 'clones_count', 'clones_uniques']
         try:
             with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=headers)
+                writer = csv.DictWriter(csvfile, fieldnames=headers, extrasaction='ignore')
                 writer.writeheader()
                 for s in self.stats:
                     writer.writerow(s)
@@ -68,4 +82,3 @@ class Formatter:
         except Exception as e:
             self.logger.error(f"Error writing JSON: {e}")
             raise
-'''}
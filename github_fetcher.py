@@ -2,6 +2,8 @@
 
 GitHubFetcher: handles communication with GitHub API to retrieve traffic stats.
 Uses PyGithub under the hood.
+A single fetcher (and its pooled HTTP session) can be reused across refreshes;
+connection_stats() reports how many requests were served by reused connections.
 '''
 import logging
 from github import Github, GithubException
@@ -11,12 +13,47 @@ class GitHubFetcher:
     """
     Fetch traffic metrics (views & clones) for all repos in a user or organization.
     """
-    def __init__(self, token: str, org: Optional[str] = None):
+    def __init__(self, token: str, org: Optional[str] = None, pool_size: Optional[int] = None,
+                 base_url: Optional[str] = None):
         self.token = token
         self.org = org
-        self.client = Github(self.token)
+        self.pool_size = pool_size
+        kwargs = {'base_url': base_url} if base_url else {}
+        self.client = Github(self.token, pool_size=pool_size, **kwargs)
         self.logger = logging.getLogger(__name__)
 
+    def connection_stats(self) -> Dict[str, int]:
+        """
+        Summarise urllib3 pool usage of the underlying requests session.
+        Returns dict with keys: pool_size, pools, connections_opened, requests, reused
+        (reused = requests that did not need a new TCP/TLS connection).
+        """
+        stats = {'pool_size': self.pool_size or 0, 'pools': 0,
+                 'connections_opened': 0, 'requests': 0, 'reused': 0}
+        # PyGithub keeps its connection (and requests.Session) private; it only
+        # exists after the first API call. Pinned by tests/test_fetcher.py.
+        requester = getattr(self.client, 'requester', None)
+        if not hasattr(requester, '_Requester__connection'):
+            self.logger.warning("PyGithub internals changed; connection stats unavailable")
+            return stats
+        connection = requester._Requester__connection
+        session = getattr(connection, 'session', None)
+        if session is None:
+            return stats
+        for adapter in session.adapters.values():
+            poolmanager = getattr(adapter, 'poolmanager', None)
+            if poolmanager is None:
+                continue
+            for key in list(poolmanager.pools.keys()):
+                pool = poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+                stats['pools'] += 1
+                stats['connections_opened'] += pool.num_connections
+                stats['requests'] += pool.num_requests
+        stats['reused'] = max(stats['requests'] - stats['connections_opened'], 0)
+        return stats
+
     def _get_account(self):
         try:
             if self.org:
@@ -33,6 +70,8 @@ class GitHubFetcher:
         """
         Fetch traffic stats for every repository under the account.
         Returns a list of dicts with keys: name, views_count, views_uniques, clones_count, clones_uniques
+        (GitHub's rolling 14-day totals) and daily: {'YYYY-MM-DD': [views_count, views_uniques,
+        clones_count, clones_uniques]} with GitHub's per-day buckets.
         """
         account = self._get_account()
         stats = []
@@ -51,12 +90,20 @@ class GitHubFetcher:
             repo = self.client.get_repo(full_name)
             views = repo.get_views_traffic()
             clones = repo.get_clones_traffic()
+            daily = {}
+            for v in views.views:
+                bucket = daily.setdefault(v.timestamp.date().isoformat(), [0, 0, 0, 0])
+                bucket[0], bucket[1] = v.count, v.uniques
+            for c in clones.clones:
+                bucket = daily.setdefault(c.timestamp.date().isoformat(), [0, 0, 0, 0])
+                bucket[2], bucket[3] = c.count, c.uniques
             return {
                 'name': repo.full_name,
                 'views_count': views.count,
                 'views_uniques': views.uniques,
                 'clones_count': clones.count,
                 'clones_uniques': clones.uniques,
+                'daily': daily,
             }
         except GithubException as e:
             self.logger.warning(f"Unable to fetch traffic for {full_name}: {e}")
@@ -0,0 +1,96 @@
+import pytest
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # admin_audit.log is opened on import
+    monkeypatch.setenv("TRAFFIC_HISTORY", str(tmp_path / "traffic_history.json"))
+    from traffic_monitor import api
+    return api
+
+
+def test_startup_survives_invalid_config(api, tmp_path, monkeypatch):
+    from traffic_monitor.config import ConfigCache
+    cfg = tmp_path / "config.yml"
+    cfg.write_text("organization: acme\n")  # no token
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.setattr(api, "CONFIG_FILE", str(cfg))
+    monkeypatch.setattr(api, "config_cache", ConfigCache(str(cfg)))
+    api.warm_github_client()  # must not raise SystemExit
+    with pytest.raises(SystemExit):
+        api.get_fetcher()
+
+
+class _FakeFetcher:
+    def __init__(self, batches):
+        self.batches = iter(batches)
+
+    def fetch_all(self):
+        return next(self.batches)
+
+
+def test_first_refresh_is_ingested_once(api, tmp_path, monkeypatch):
+    from datetime import datetime, timedelta
+    from fastapi.testclient import TestClient
+    from traffic_monitor.compression import dump_json
+    from traffic_monitor.leaderboard import LeaderboardIndex
+
+    today = datetime.now()
+    yesterday = today - timedelta(days=1)
+    history_file = tmp_path / "history.json"
+    dump_json(str(history_file), [{'name': 'org/a', 'views_count': 0, 'views_uniques': 0,
+                                   'clones_count': 4, 'clones_uniques': 4,
+                                   'daily': {yesterday.date().isoformat(): [0, 0, 4, 4]},
+                                   'timestamp': yesterday.isoformat()}])
+    monkeypatch.setattr(api, "HISTORY_FILE", str(history_file))
+    monkeypatch.setattr(api, "leaderboard", LeaderboardIndex())
+    monkeypatch.setattr(api, "_leaderboard_built", False)
+    fetched = [{'name': 'org/a', 'views_count': 3, 'views_uniques': 1,
+                'clones_count': 13, 'clones_uniques': 13,
+                'daily': {yesterday.date().isoformat(): [0, 0, 4, 4],
+                          today.date().isoformat(): [3, 1, 9, 9]}}]
+    monkeypatch.setattr(api, "get_fetcher", lambda: _FakeFetcher([fetched]))
+    import traffic_monitor.security as security
+    monkeypatch.setattr(security, "API_KEY_VALUE", "k")
+
+    client = TestClient(api.app)
+    resp = client.post("/api/refresh", headers={"x-api-key": "k"})
+    assert resp.status_code == 200
+    assert resp.json()["history_len"] == 2
+    top = client.get("/api/top", params={"metric": "clones_uniques", "window": "7d"},
+                     headers={"x-api-key": "k"}).json()["top"]
+    assert top == [{'name': 'org/a', 'metric': 'clones_uniques', 'window': '7d',
+                    'gain': 13, 'value': 13}]
+
+
+@pytest.mark.parametrize("params", [{"metric": "stars"}, {"window": "2d"}, {"n": 0}])
+def test_top_rejects_bad_query_before_touching_index(api, monkeypatch, params):
+    from fastapi.testclient import TestClient
+    import traffic_monitor.security as security
+    monkeypatch.setattr(security, "API_KEY_VALUE", "k")
+    monkeypatch.setattr(api, "get_leaderboard", lambda: pytest.fail("index queried"))
+    resp = TestClient(api.app).get("/api/top", params=params, headers={"x-api-key": "k"})
+    assert resp.status_code == 400
+
+
+def test_rebuilding_fetcher_closes_old_client(api, tmp_path, monkeypatch):
+    from traffic_monitor.config import ConfigCache
+
+    class _Client:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    class _OldFetcher:
+        client = _Client()
+
+    cfg = tmp_path / "config.yml"
+    cfg.write_text(f"token: t\noutput_dir: {tmp_path}\n")
+    old = _OldFetcher()
+    monkeypatch.setattr(api, "config_cache", ConfigCache(str(cfg)))
+    monkeypatch.setattr(api, "_fetcher", old)
+    monkeypatch.setattr(api, "_fetcher_generation", 0)
+    fetcher = api.get_fetcher()
+    assert fetcher is not old and fetcher.token == "t"
+    assert old.client.closed
@@ -0,0 +1,171 @@
+import gzip
+import json
+import threading
+
+import pytest
+
+from traffic_monitor import compression
+from traffic_monitor.compression import (
+    PayloadCache, cached_json_response, dump_json, file_stamp, load_json, negotiate
+)
+
+
+class _Request:
+    def __init__(self, accept_encoding=None):
+        self.headers = {'accept-encoding': accept_encoding} if accept_encoding else {}
+
+
+def _history(n=200):
+    return [{'name': f"org/repo-{i}", 'views_count': i, 'views_uniques': i,
+             'clones_count': i, 'clones_uniques': i, 'timestamp': "2025-01-01T00:00:00"}
+            for i in range(n)]
+
+
+@pytest.fixture
+def gzip_only(monkeypatch):
+    monkeypatch.setattr(compression, 'CODECS', {'gzip': compression._gzip})
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("deflate, gzip;q=0.5", "gzip"),
+    ("gzip;q=0", None),
+    ("*", "gzip"),
+    ("*;q=0.3, gzip;q=0", None),
+    ("GZIP;q=bogus", None),
+])
+def test_negotiate_q_values(gzip_only, header, expected):
+    assert negotiate(header) == expected
+
+
+def test_negotiate_prefers_highest_q(monkeypatch):
+    monkeypatch.setattr(compression, 'CODECS', {'zstd': None, 'br': None, 'gzip': None})
+    assert negotiate("gzip, br, zstd") == "zstd"
+    assert negotiate("gzip;q=1.0, zstd;q=0.5") == "gzip"
+    assert negotiate("br;q=0.9, zstd;q=0.1") == "br"
+
+
+def test_response_compressed_above_threshold(gzip_only, monkeypatch):
+    monkeypatch.setattr(compression, 'payload_cache', PayloadCache())
+    monkeypatch.setattr(compression, 'COMPRESS_MIN_BYTES', 100)
+    data = {'history': _history()}
+    resp = cached_json_response(_Request("gzip"), "traffic", 1, lambda: data)
+    assert resp.headers['content-encoding'] == 'gzip'
+    assert resp.headers['vary'] == 'Accept-Encoding'
+    assert json.loads(gzip.decompress(resp.body)) == data
+
+
+def test_response_identity_below_threshold_or_not_accepted(gzip_only, monkeypatch):
+    monkeypatch.setattr(compression, 'payload_cache', PayloadCache())
+    monkeypatch.setattr(compression, 'COMPRESS_MIN_BYTES', 10_000)
+    small = cached_json_response(_Request("gzip"), "small", 1, lambda: {'history': []})
+    assert 'content-encoding' not in small.headers
+    assert small.headers['vary'] == 'Accept-Encoding'
+    assert json.loads(small.body) == {'history': []}
+
+    monkeypatch.setattr(compression, 'COMPRESS_MIN_BYTES', 0)
+    plain = cached_json_response(_Request(), "plain", 1, lambda: {'history': _history()})
+    assert 'content-encoding' not in plain.headers
+
+
+def test_payload_cache_compresses_once_until_stamp_changes(gzip_only, tmp_path, monkeypatch):
+    calls = {'build': 0, 'gzip': 0}
+
+    def counting_gzip(data):
+        calls['gzip'] += 1
+        return gzip.compress(data)
+    monkeypatch.setattr(compression, 'CODECS', {'gzip': counting_gzip})
+
+    path = tmp_path / "traffic_history.json"
+    dump_json(str(path), _history(3))
+
+    def build():
+        calls['build'] += 1
+        return {'history': load_json(str(path))}
+
+    cache = PayloadCache()
+    first = cache.get("traffic", file_stamp(str(path)), build, 'gzip')
+    assert cache.get("traffic", file_stamp(str(path)), build, 'gzip') is first
+    assert calls == {'build': 1, 'gzip': 1}
+
+    dump_json(str(path), _history(5))
+    second = cache.get("traffic", file_stamp(str(path)), build, 'gzip')
+    assert calls == {'build': 2, 'gzip': 2}
+    assert len(json.loads(gzip.decompress(second))['history']) == 5
+
+    cache.invalidate("traffic")
+    cache.get("traffic", file_stamp(str(path)), build, None)
+    assert calls['build'] == 3
+
+
+def test_payload_cache_evicts_least_recently_used():
+    cache = PayloadCache(max_entries=2)
+    cache.get("a", 1, lambda: 1, None)
+    cache.get("b", 1, lambda: 2, None)
+    cache.get("a", 1, lambda: pytest.fail("a was evicted"), None)
+    cache.get("c", 1, lambda: 3, None)  # evicts b, the least recently used
+    assert list(cache._entries) == ["a", "c"]
+
+
+def test_json_gz_round_trip(tmp_path):
+    path = tmp_path / "traffic_history.json.gz"
+    data = _history()
+    dump_json(str(path), data)
+    raw = path.read_bytes()
+    assert raw[:2] == b'\x1f\x8b'
+    assert b' ' not in gzip.decompress(raw)  # compact separators
+    assert load_json(str(path)) == data
+    assert [p.name for p in tmp_path.iterdir()] == ["traffic_history.json.gz"]
+
+
+def test_plain_json_stays_pretty(tmp_path):
+    path = tmp_path / "traffic_history.json"
+    dump_json(str(path), _history(2))
+    assert path.read_text().startswith('[\n  {')
+    assert load_json(str(path)) == _history(2)
+
+
+def test_file_stamp_missing(tmp_path):
+    assert file_stamp(str(tmp_path / "nope.json")) is None
+
+
+def test_benchmark_reports_write_and_load_cost():
+    rows = compression.benchmark(_history(50), rounds=1)
+    names = [r[0] for r in rows]
+    assert names[:2] == ['json indent=2', 'json compact'] and 'gzip' in names
+    for name, size, ratio, write_ms, load_ms in rows:
+        assert size > 0 and 0 < ratio <= 1.0
+        assert write_ms >= 0 and load_ms >= 0
+
+
+def test_concurrent_dump_json_never_exposes_partial_file(tmp_path):
+    path = tmp_path / "traffic_history.json"
+    dump_json(str(path), _history(1))
+    errors = []
+
+    def writer(n):
+        try:
+            for _ in range(20):
+                dump_json(str(path), _history(n))
+                assert len(load_json(str(path))) in (1, 50, 100, 150, 200)
+        except Exception as e:  # pragma: no cover - surfaced below
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in (50, 100, 150, 200)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert [p.name for p in tmp_path.iterdir()] == ["traffic_history.json"]
+
+
+def test_dump_json_keeps_file_mode(tmp_path):
+    path = tmp_path / "traffic_history.json"
+    path.write_text("[]")
+    path.chmod(0o640)
+    dump_json(str(path), _history(1))
+    assert path.stat().st_mode & 0o777 == 0o640
@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from traffic_monitor.config import ConfigCache
+
+
+def write(path, text, bump):
+    path.write_text(text)
+    # Force a new stamp even on filesystems with coarse mtimes
+    os.utime(path, ns=(bump * 10**9, bump * 10**9))
+
+
+@pytest.fixture(autouse=True)
+def no_env_token(monkeypatch):
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+
+
+def test_reloads_only_when_file_changes(tmp_path):
+    cfg = tmp_path / "config.yml"
+    write(cfg, f"token: a\noutput_dir: {tmp_path}\n", 1)
+    cache = ConfigCache(str(cfg))
+    first = cache.get()
+    assert cache.get() is first and cache.generation == 1
+    write(cfg, f"token: bb\noutput_dir: {tmp_path}\n", 2)
+    assert cache.get().token == "bb" and cache.generation == 2
+
+
+@pytest.mark.parametrize("bad", ["organization: acme\n", "token: [unclosed\n"])
+def test_bad_edit_keeps_last_good_config(tmp_path, bad):
+    cfg = tmp_path / "config.yml"
+    write(cfg, f"token: a\noutput_dir: {tmp_path}\n", 1)
+    cache = ConfigCache(str(cfg))
+    good = cache.get()
+    write(cfg, bad, 2)
+    assert cache.get() is good
+    assert cache.generation == 1
+    write(cfg, f"token: c\noutput_dir: {tmp_path}\n", 3)
+    assert cache.get().token == "c" and cache.generation == 2
+
+
+def test_first_load_still_fails(tmp_path):
+    cfg = tmp_path / "config.yml"
+    write(cfg, "organization: acme\n", 1)
+    with pytest.raises(SystemExit):
+        ConfigCache(str(cfg)).get()
@@ -0,0 +1,51 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from traffic_monitor.fetcher import GitHubFetcher
+
+
+class _FakeGitHub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so the pool can reuse connections
+
+    def do_GET(self):
+        login = self.path.rstrip('/').rsplit('/', 1)[-1]
+        body = json.dumps({"login": login, "id": 1, "type": "User"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_github():
+    server = HTTPServer(("127.0.0.1", 0), _FakeGitHub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_connection_stats_before_first_request():
+    fetcher = GitHubFetcher(token="t", pool_size=4)
+    stats = fetcher.connection_stats()
+    assert stats == {'pool_size': 4, 'pools': 0, 'connections_opened': 0, 'requests': 0, 'reused': 0}
+
+
+def test_connection_stats_reports_reuse(fake_github):
+    # Pins the PyGithub internals connection_stats() relies on: if they move,
+    # requests stays at 0 and this fails instead of /api/health silently reporting zeros.
+    fetcher = GitHubFetcher(token="t", pool_size=4, base_url=fake_github)
+    for name in ("octocat", "hubot", "monalisa"):
+        assert fetcher.client.get_user(name).login == name
+    stats = fetcher.connection_stats()
+    assert stats['requests'] == 3
+    assert stats['connections_opened'] == 1
+    assert stats['reused'] == 2
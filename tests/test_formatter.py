@@ -0,0 +1,26 @@
+from traffic_monitor.formatter import Formatter
+
+
+def test_print_table(capsys):
+    stats = [{'name': 'org/a', 'views_count': 5, 'views_uniques': 2,
+              'clones_count': 1, 'clones_uniques': 1}]
+    Formatter(stats).print('table')
+    out = capsys.readouterr().out
+    assert 'Unique Clones' in out and 'org/a' in out
+
+
+def test_print_top(capsys):
+    rows = [
+        {'name': 'org/a', 'metric': 'clones_uniques', 'window': '7d', 'gain': 12, 'value': 30},
+        {'name': 'org/b', 'metric': 'clones_uniques', 'window': '7d', 'gain': 4, 'value': 9},
+    ]
+    Formatter(rows).print('TOP')
+    lines = capsys.readouterr().out.splitlines()
+    assert 'clones_uniques gain (7d)' in lines[0]
+    cells = [[c.strip() for c in line.strip('|').split('|')] for line in lines[2:]]
+    assert cells == [['1', 'org/a', '12', '30'], ['2', 'org/b', '4', '9']]
+
+
+def test_print_top_empty(capsys):
+    Formatter([]).print('top')
+    assert 'gain' in capsys.readouterr().out
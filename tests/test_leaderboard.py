@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from traffic_monitor.leaderboard import LeaderboardIndex, benchmark
+
+BASE = datetime(2025, 1, 1, 6, 0)
+
+
+class FakeRepo:
+    """Simulates GitHub's traffic API: per-day buckets and rolling 14-day totals."""
+    def __init__(self, name, clones_per_day):
+        self.name = name
+        self.clones_per_day = clones_per_day  # callable: day index -> unique cloners
+
+    def snapshot(self, at):
+        days = [at.date() - timedelta(days=k) for k in range(14)]
+        daily = {}
+        for d in days:
+            n = self.clones_per_day((d - BASE.date()).days)
+            if d == at.date():
+                n = n * at.hour // 24  # today's bucket is still filling up
+            daily[d.isoformat()] = [n * 3, n * 2, n, n]
+        return {
+            'name': self.name,
+            'views_count': sum(v[0] for v in daily.values()),
+            'views_uniques': sum(v[1] for v in daily.values()),
+            'clones_count': sum(v[2] for v in daily.values()),
+            'clones_uniques': sum(v[3] for v in daily.values()),
+            'daily': daily,
+            'timestamp': at.isoformat(),
+        }
+
+
+def run(index, repos, days, per_day=1, start=0):
+    for day in range(start, start + days):
+        for r in range(per_day):
+            at = BASE + timedelta(days=day, hours=r * 18 // per_day)  # 06:00..23:00
+            index.ingest([repo.snapshot(at) for repo in repos])
+
+
+def test_steady_traffic_counts_as_gain():
+    # Rolling 14-day totals never change for steady traffic; the gain must not be 0
+    steady = FakeRepo("org/steady", lambda d: 10)
+    index = LeaderboardIndex()
+    run(index, [steady], days=40)
+    assert index.top('clones_uniques', '7d', 1)[0]['gain'] == 6 * 10 + 10 * 6 // 24
+    assert index.top('clones_uniques', '30d', 1)[0]['gain'] == 29 * 10 + 10 * 6 // 24
+    assert index.top('clones_uniques', '7d', 1)[0]['value'] == 13 * 10 + 10 * 6 // 24
+
+
+def test_ranks_by_cloners_gained_this_week():
+    repos = [
+        FakeRepo("org/steady", lambda d: 10),
+        FakeRepo("org/new-hit", lambda d: 40 if d >= 36 else 0),   # took off 4 days ago
+        FakeRepo("org/faded", lambda d: 50 if d < 20 else 1),      # big 14d total earlier
+    ]
+    index = LeaderboardIndex()
+    run(index, repos, days=40)
+    names = [r['name'] for r in index.top('clones_uniques', '7d', 3)]
+    assert names == ["org/new-hit", "org/steady", "org/faded"]
+
+
+@pytest.mark.parametrize("per_day", [1, 6, 24])
+def test_result_independent_of_refresh_frequency(per_day):
+    repo = FakeRepo("org/a", lambda d: d % 7)
+    index = LeaderboardIndex()
+    run(index, [repo], days=35, per_day=per_day)
+    index.ingest([repo.snapshot((BASE + timedelta(days=34)).replace(hour=23, minute=30))])
+    full_week = sum(d % 7 for d in range(28, 34)) + 34 % 7 * 23 // 24
+    assert index.top('clones_uniques', '7d', 1)[0]['gain'] == full_week
+
+
+def test_incremental_matches_build():
+    repos = [FakeRepo(f"org/r{i}", lambda d, i=i: (d * (i + 1)) % 13) for i in range(5)]
+    live = LeaderboardIndex()
+    history = []
+    for day in range(45):
+        for hour in (3, 15):
+            batch = [r.snapshot(BASE.replace(hour=hour) + timedelta(days=day)) for r in repos]
+            history.extend(batch)
+            live.ingest(batch)
+    rebuilt = LeaderboardIndex()
+    rebuilt.build(history)
+    for window in ('1d', '7d', '14d', '30d'):
+        assert live.top('views_count', window, 5) == rebuilt.top('views_count', window, 5)
+
+
+def test_repo_that_stops_reporting_expires():
+    a = FakeRepo("org/a", lambda d: 1)
+    b = FakeRepo("org/b", lambda d: 35)
+    index = LeaderboardIndex()
+    run(index, [a, b], days=2)
+    assert index.top('clones_uniques', '7d', 1)[0]['name'] == 'org/b'
+    for day in range(2, 42):
+        run(index, [a], days=1, start=day)
+        names = [r['name'] for r in index.top('clones_uniques', '7d', 5)]
+        if day >= 8:
+            assert names == ['org/a']
+    assert [r['name'] for r in index.top('clones_uniques', '30d', 5)] == ['org/a']
+    assert 'org/b' not in index._repos
+
+
+def test_day_buckets_outside_window_are_pruned():
+    repo = FakeRepo("org/a", lambda d: 1)
+    index = LeaderboardIndex()
+    run(index, [repo], days=60)
+    assert min(index._repos['org/a'].days) > (BASE + timedelta(days=59)).date() - timedelta(days=30)
+
+
+def test_reingesting_a_built_batch_is_a_noop():
+    repo = FakeRepo("org/a", lambda d: 7)
+    history = [repo.snapshot(BASE + timedelta(days=d)) for d in range(3)]
+    index = LeaderboardIndex()
+    index.build(history)
+    before = index.top('clones_uniques', '7d', 1)
+    index.ingest(history[-1:])
+    assert index.top('clones_uniques', '7d', 1) == before
+
+
+def test_snapshots_without_daily_buckets():
+    index = LeaderboardIndex()
+    index.build([{'name': 'org/old', 'views_count': 9, 'views_uniques': 1, 'clones_count': 1,
+                  'clones_uniques': 1, 'timestamp': BASE.isoformat()}])
+    assert index.top('views_count', '7d') == [
+        {'name': 'org/old', 'metric': 'views_count', 'window': '7d', 'gain': 0, 'value': 9}
+    ]
+
+
+def test_build_empty_history():
+    index = LeaderboardIndex()
+    index.build([])
+    assert index.top('views_count', '30d') == []
+
+
+@pytest.mark.parametrize("metric, window", [("stars", "7d"), ("views_count", "2d")])
+def test_top_rejects_unknown_metric_or_window(metric, window):
+    with pytest.raises(ValueError):
+        LeaderboardIndex().top(metric, window)
+
+
+def test_benchmark_smoke():
+    result = benchmark(repos=50, days=5)
+    assert set(result) == {'build_ms', 'ingest_ms', 'rollover_ms', 'top_ms'}
@@ -0,0 +1,190 @@
+import json
+import threading
+import time
+
+import pytest
+
+from traffic_monitor.notifier import (
+    AlertBatcher, AlertSink, AnomalyDetector, AnomalyEngine, FileSink, SmtpSink,
+    WebhookSink, benchmark, build_sinks_from_env
+)
+
+
+def snap(views=100, name="org/a", ts="2025-01-01T00:00:00"):
+    return {'name': name, 'views_count': views, 'views_uniques': 10,
+            'clones_count': 5, 'clones_uniques': 2, 'timestamp': ts}
+
+
+def read_lines(path):
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class FailingSink(AlertSink):
+    def __init__(self):
+        self.calls = 0
+
+    def send(self, alerts):
+        self.calls += 1
+        raise ConnectionError("sink down")
+
+
+def make_engine(sinks, cooldown=3600, background=False):
+    return AnomalyEngine(AnomalyDetector(), AlertBatcher(sinks, cooldown=cooldown, background=background))
+
+
+def warm(engine, n=8, name="org/a"):
+    for k in range(n):
+        assert engine.ingest([snap(100 + k % 3, name=name)]) == []
+
+
+def test_alert_sink_is_abstract():
+    with pytest.raises(TypeError):
+        AlertSink()
+
+
+def test_spike_written_to_file_sink(tmp_path):
+    out = tmp_path / "alerts.jsonl"
+    engine = make_engine([FileSink(str(out))])
+    warm(engine)
+    queued = engine.ingest([snap(900, ts="2025-01-09T00:00:00")])
+    lines = read_lines(out)
+    assert lines == queued
+    assert len(lines) == 1
+    alert = lines[0]
+    assert (alert['repo'], alert['metric'], alert['direction'], alert['value']) == \
+        ('org/a', 'views_count', 'spike', 900)
+    assert alert['expected'] == pytest.approx(101, abs=1)
+    assert alert['zscore'] > 3
+    assert alert['timestamp'] == "2025-01-09T00:00:00"
+
+
+def test_no_alerts_during_warmup_or_steady_traffic(tmp_path):
+    out = tmp_path / "alerts.jsonl"
+    engine = make_engine([FileSink(str(out))])
+    assert engine.ingest([snap(100)]) == []
+    assert engine.ingest([snap(5000)]) == []  # still warming up
+    assert read_lines(out) == []
+
+
+def test_repeated_refreshes_of_unchanged_numbers_do_not_alert(tmp_path):
+    out = tmp_path / "alerts.jsonl"
+    engine = make_engine([FileSink(str(out))])
+    for k in range(12):
+        engine.ingest([snap([100, 112, 94, 106][k % 4])])
+    for _ in range(24):  # refreshing faster than GitHub updates its numbers
+        assert engine.ingest([snap(106)]) == []
+    assert engine.detector.states['org/a'].count == 12
+    assert engine.ingest([snap(114)]) == []  # within normal variation
+    assert read_lines(out) == []
+
+
+def test_drop_direction(tmp_path):
+    out = tmp_path / "alerts.jsonl"
+    engine = make_engine([FileSink(str(out))])
+    warm(engine)
+    engine.ingest([snap(0)])
+    assert [a['direction'] for a in read_lines(out)] == ['drop']
+
+
+def test_prime_warms_baselines_without_alerting(tmp_path):
+    out = tmp_path / "alerts.jsonl"
+    engine = make_engine([FileSink(str(out))])
+    engine.prime([snap(100 + k % 3) for k in range(8)] + [snap(900)])
+    assert read_lines(out) == []
+    assert engine.detector.states['org/a'].count == 9
+
+
+def test_duplicates_batched_and_cooldown_applied(tmp_path):
+    out = tmp_path / "alerts.jsonl"
+    engine = make_engine([FileSink(str(out))])
+    warm(engine, name="org/a")
+    warm(engine, name="org/b")
+    engine.ingest([snap(900, name="org/a"), snap(900, name="org/b")])
+    engine.ingest([snap(5000, name="org/a")])  # same repo/metric/direction within cooldown
+    assert sorted(a['repo'] for a in read_lines(out)) == ['org/a', 'org/b']
+
+
+def test_cooldown_expiry_allows_resend(tmp_path):
+    out = tmp_path / "alerts.jsonl"
+    engine = make_engine([FileSink(str(out))], cooldown=0)
+    warm(engine)
+    engine.ingest([snap(900)])
+    engine.ingest([snap(9000)])
+    assert [a['value'] for a in read_lines(out)] == [900, 9000]
+
+
+def test_failed_delivery_is_retried_not_muted(tmp_path):
+    out = tmp_path / "alerts.jsonl"
+    failing = FailingSink()
+    batcher = AlertBatcher([failing], cooldown=3600, background=False)
+    engine = AnomalyEngine(AnomalyDetector(), batcher)
+    warm(engine)
+    engine.ingest([snap(900)])
+    assert failing.calls == 1
+    # Sink recovers: the pending alert goes out with the next flush
+    batcher.sinks = [FileSink(str(out))]
+    engine.ingest([snap(101)])
+    assert [a['value'] for a in read_lines(out)] == [900]
+    # ...and only now is it under cooldown
+    engine.ingest([snap(5000)])
+    assert len(read_lines(out)) == 1
+
+
+def test_one_working_sink_counts_as_delivered(tmp_path):
+    out = tmp_path / "alerts.jsonl"
+    engine = make_engine([FailingSink(), FileSink(str(out))])
+    warm(engine)
+    engine.ingest([snap(900)])
+    engine.ingest([snap(5000)])
+    assert len(read_lines(out)) == 1
+
+
+def test_background_dispatch_does_not_block_ingest(tmp_path):
+    out = tmp_path / "alerts.jsonl"
+    release = threading.Event()
+
+    class SlowSink(FileSink):
+        def send(self, alerts):
+            release.wait(5)
+            super().send(alerts)
+
+    engine = make_engine([SlowSink(str(out))], background=True)
+    warm(engine)
+    start = time.perf_counter()
+    assert len(engine.ingest([snap(900)])) == 1
+    assert engine.ingest([snap(101)]) == []  # ingest not blocked by the slow sink
+    assert time.perf_counter() - start < 1
+    assert read_lines(out) == []
+    release.set()
+    engine.batcher.join()
+    assert [a['value'] for a in read_lines(out)] == [900]
+
+
+def test_build_sinks_from_env(tmp_path, monkeypatch):
+    for var in ("TRAFFIC_ALERT_WEBHOOK", "TRAFFIC_ALERT_SMTP_HOST", "TRAFFIC_ALERT_SMTP_TO",
+                "TRAFFIC_ALERT_FILE"):
+        monkeypatch.delenv(var, raising=False)
+    assert build_sinks_from_env() == []
+
+    monkeypatch.setenv("TRAFFIC_ALERT_WEBHOOK", "https://hooks.example.com/x")
+    monkeypatch.setenv("TRAFFIC_ALERT_SMTP_HOST", "smtp.example.com")
+    monkeypatch.setenv("TRAFFIC_ALERT_SMTP_TO", "a@example.com,b@example.com")
+    monkeypatch.setenv("TRAFFIC_ALERT_FILE", str(tmp_path / "alerts.jsonl"))
+    webhook, smtp, file_sink = build_sinks_from_env()
+    assert isinstance(webhook, WebhookSink) and webhook.url == "https://hooks.example.com/x"
+    assert isinstance(smtp, SmtpSink)
+    assert (smtp.port, smtp.recipients) == (587, ["a@example.com", "b@example.com"])
+    assert isinstance(file_sink, FileSink)
+
+
+def test_smtp_requires_recipients(monkeypatch):
+    for var in ("TRAFFIC_ALERT_WEBHOOK", "TRAFFIC_ALERT_SMTP_TO", "TRAFFIC_ALERT_FILE"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setenv("TRAFFIC_ALERT_SMTP_HOST", "smtp.example.com")
+    assert build_sinks_from_env() == []
+
+
+def test_benchmark_smoke():
+    assert benchmark(repos=100, snapshots=5) > 0
@@ -0,0 +1,253 @@
+'''src/traffic_monitor/compression.py
+
+Response and at-rest compression for GitHub Traffic Monitor.
+- Accept-Encoding negotiation (gzip always; zstd / brotli when installed)
+- Cache of precompressed payloads so unchanged reads are compressed once
+- Compact, optionally compressed JSON history files (.json.gz / .json.zst)
+
+Run `python -m traffic_monitor.compression [history.json]` for a CPU vs bytes benchmark.
+'''
+import os
+import gzip
+import json
+import time
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from starlette.responses import Response
+from traffic_monitor.config import file_stamp
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.getenv("TRAFFIC_COMPRESS_MIN_BYTES", "1024"))
+PAYLOAD_CACHE_ENTRIES = int(os.getenv("TRAFFIC_PAYLOAD_CACHE_ENTRIES", "256"))
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+BROTLI_QUALITY = 5
+
+
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _zstd(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+
+def _brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=BROTLI_QUALITY)
+
+
+# Preference order when the client accepts several encodings equally
+CODECS: Dict[str, Callable[[bytes], bytes]] = {}
+if zstandard is not None:
+    CODECS['zstd'] = _zstd
+if brotli is not None:
+    CODECS['br'] = _brotli
+CODECS['gzip'] = _gzip
+
+DECODERS: Dict[str, Callable[[bytes], bytes]] = {'gzip': gzip.decompress}
+if zstandard is not None:
+    DECODERS['zstd'] = lambda data: zstandard.ZstdDecompressor().decompress(data)
+if brotli is not None:
+    DECODERS['br'] = brotli.decompress
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the best supported encoding from an Accept-Encoding header.
+    Returns None when the client accepts none of ours (identity).
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+    best, best_q = None, 0.0
+    for name in CODECS:
+        q = weights.get(name, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    return CODECS[encoding](data)
+
+
+class PayloadCache:
+    """
+    Caches a serialized JSON body plus its compressed variants per key.
+    An entry is valid while its `version` (e.g. a file mtime/size stamp) is unchanged,
+    so each unchanged payload is serialized and compressed at most once per encoding.
+    Holds at most `max_entries` keys, evicting the least recently used.
+    """
+    def __init__(self, max_entries: int = PAYLOAD_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, Dict[Optional[str], bytes]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: Any, build: Callable[[], Any], encoding: Optional[str]) -> bytes:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                body = json.dumps(build(), separators=(',', ':')).encode('utf-8')
+                entry = (version, {None: body})
+                self._entries[key] = entry
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            self._entries.move_to_end(key)
+            variants = entry[1]
+            if encoding not in variants:
+                variants[encoding] = compress(variants[None], encoding)
+            return variants[encoding]
+
+    def invalidate(self, key: Optional[str] = None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+payload_cache = PayloadCache()
+
+
+def cached_json_response(request, key: str, version: Any, build: Callable[[], Any]) -> Response:
+    """
+    Serve a cacheable JSON read, compressed when the client allows it and the
+    body is at least COMPRESS_MIN_BYTES.
+    """
+    encoding = negotiate(request.headers.get('accept-encoding'))
+    body = payload_cache.get(key, version, build, None)
+    headers = {'Vary': 'Accept-Encoding'}
+    if encoding is not None and len(body) >= COMPRESS_MIN_BYTES:
+        body = payload_cache.get(key, version, build, encoding)
+        headers['Content-Encoding'] = encoding
+    return Response(content=body, media_type='application/json', headers=headers)
+
+
+# --- History at rest ---
+def _codec_for_path(path: Path) -> Optional[str]:
+    if path.suffix == '.gz':
+        return 'gzip'
+    if path.suffix == '.zst':
+        if zstandard is None:
+            raise RuntimeError("zstandard not installed. Install via `pip install zstandard`.")
+        return 'zstd'
+    return None
+
+
+def load_json(path: str):
+    """Read a JSON file, transparently decompressing .gz / .zst."""
+    file = Path(path)
+    codec = _codec_for_path(file)
+    raw = file.read_bytes()
+    if codec is not None:
+        raw = DECODERS[codec](raw)
+    return json.loads(raw)
+
+
+def dump_json(path: str, data):
+    """
+    Write JSON to `path`. Compressed suffixes (.gz / .zst) get compact JSON;
+    plain files keep indent=2 so they stay human-readable.
+    Each write goes to its own temp file in the same directory and is then
+    renamed over `path`, so concurrent writers never clobber each other's temp
+    file and readers never see a partial write.
+    """
+    file = Path(path)
+    codec = _codec_for_path(file)
+    if codec is None:
+        raw = json.dumps(data, indent=2).encode('utf-8')
+    else:
+        raw = compress(json.dumps(data, separators=(',', ':')).encode('utf-8'), codec)
+    fd, tmp = tempfile.mkstemp(dir=file.parent, prefix=file.name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(raw)
+        # mkstemp creates 0600; keep the permissions the history file already had
+        os.chmod(tmp, file.stat().st_mode & 0o777 if file.exists() else 0o644)
+        os.replace(tmp, file)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+# --- Benchmark ---
+def _time_ms(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def benchmark(data, rounds: int = 20) -> list:
+    """
+    Measure CPU cost vs bytes saved for each history format on `data`.
+    Returns rows of (format, bytes, ratio vs pretty JSON, ms to write, ms to load),
+    where write = serialize + compress and load = decompress + parse.
+    """
+    pretty = json.dumps(data, indent=2).encode('utf-8')
+    compact = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    rows = [
+        ('json indent=2', len(pretty), 1.0,
+         _time_ms(lambda: json.dumps(data, indent=2).encode('utf-8'), rounds),
+         _time_ms(lambda: json.loads(pretty), rounds)),
+        ('json compact', len(compact), len(compact) / len(pretty),
+         _time_ms(lambda: json.dumps(data, separators=(',', ':')).encode('utf-8'), rounds),
+         _time_ms(lambda: json.loads(compact), rounds)),
+    ]
+    for name, fn in CODECS.items():
+        out = fn(compact)
+        decode = DECODERS[name]
+        rows.append((
+            name, len(out), len(out) / len(pretty),
+            _time_ms(lambda: fn(json.dumps(data, separators=(',', ':')).encode('utf-8')), rounds),
+            _time_ms(lambda: json.loads(decode(out)), rounds),
+        ))
+    return rows
+
+
+def _synthetic_history(repos: int = 500, snapshots: int = 30) -> list:
+    history = []
+    for day in range(snapshots):
+        ts = f"2025-01-{day % 28 + 1:02d}T00:00:00"
+        for i in range(repos):
+            history.append({
+                'name': f"org/repo-{i}",
+                'views_count': (i * 37 + day * 11) % 5000,
+                'views_uniques': (i * 7 + day) % 400,
+                'clones_count': (i * 13 + day * 3) % 300,
+                'clones_uniques': (i + day) % 50,
+                'timestamp': ts,
+            })
+    return history
+
+
+if __name__ == '__main__':
+    import sys
+    from tabulate import tabulate
+    data = load_json(sys.argv[1]) if len(sys.argv) > 1 else _synthetic_history()
+    rows = benchmark(data)
+    print(tabulate(rows, headers=['Format', 'Bytes', 'Ratio', 'ms/write', 'ms/load'],
+                   tablefmt='github', floatfmt='.3f'))
@@ -0,0 +1,289 @@
+'''src/traffic_monitor/leaderboard.py
+
+LeaderboardIndex: per-window sums of GitHub's daily traffic buckets maintained at
+ingest, so top-N queries ("most unique cloners gained this week") never rescan history.
+
+Run `python -m traffic_monitor.leaderboard` for a build/ingest/top benchmark.
+'''
+import heapq
+import logging
+import threading
+import time
+from functools import lru_cache
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+METRICS = ('views_count', 'views_uniques', 'clones_count', 'clones_uniques')
+WINDOWS = {'1d': 1, '7d': 7, '14d': 14, '30d': 30}  # calendar days, ending today (UTC)
+MAX_DAYS = max(WINDOWS.values())
+
+
+@lru_cache(maxsize=4096)
+def _parse_day(day: str) -> date:
+    return date.fromisoformat(day)
+
+
+@lru_cache(maxsize=4096)
+def _parse_ts(ts: str) -> datetime:
+    # One refresh stamps every repo with the same timestamp string
+    return datetime.fromisoformat(ts)
+
+
+class _Repo:
+    __slots__ = ('last_seen', 'totals', 'days')
+
+    def __init__(self):
+        self.last_seen: Optional[datetime] = None
+        self.totals = [0] * len(METRICS)
+        self.days: Dict[date, list] = {}
+
+
+class LeaderboardIndex:
+    """
+    Ranks repos by how much traffic they gained over a window of calendar days.
+
+    GitHub's count/uniques are rolling 14-day totals, so differencing snapshots does
+    not measure a gain. Instead each snapshot's `daily` buckets (GitHub's per-day
+    breakdown, see GitHubFetcher.fetch_all) are kept per repo, keyed by day, with a
+    re-fetched day overwriting the earlier value. The gain for a window is the sum of
+    the buckets for its last N days, up to and including the day of the newest ingest
+    (`as_of`). Daily uniques are summed, so a visitor seen on two days counts twice.
+
+    Sums are updated incrementally: ingest only touches buckets whose value changed,
+    and a day rollover subtracts only the day leaving each window. Cost depends on
+    the number of repos, not on how often refreshes run. A repo not fetched within a
+    window drops out of it, and is forgotten after MAX_DAYS. Snapshots not newer than
+    a repo's latest one are ignored, so re-ingesting a batch is a no-op.
+    top() is a heap-based partial selection, O(repos * log n).
+    """
+    def __init__(self):
+        self.as_of: Optional[datetime] = None
+        self.version = 0
+        self._today: Optional[date] = None
+        self._repos: Dict[str, _Repo] = {}
+        self._sums: Dict[str, Dict[str, list]] = {w: {} for w in WINDOWS}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def build(self, history: Iterable[Dict]):
+        """
+        Rebuild the index from a full history (used once at startup).
+        History is walked newest-first, so the latest value of each day wins and
+        snapshots whose days are all covered by newer ones are skipped.
+        """
+        with self._lock:
+            self.as_of = None
+            self._today = None
+            self._repos.clear()
+            covered_from: Dict[str, str] = {}
+            for s in reversed(list(history)):
+                ts = _parse_ts(s['timestamp'])
+                name = s['name']
+                repo = self._repos.get(name)
+                if repo is None:
+                    repo = self._repos[name] = _Repo()
+                if repo.last_seen is None or ts > repo.last_seen:
+                    repo.last_seen = ts
+                    repo.totals = [s[m] for m in METRICS]
+                if self.as_of is None or ts > self.as_of:
+                    self.as_of = ts
+                daily = s.get('daily')
+                if not daily:
+                    continue
+                first = min(daily)  # ISO dates sort lexically
+                covered = covered_from.get(name)
+                if covered is None:
+                    for day_str, vals in daily.items():
+                        repo.days[_parse_day(day_str)] = list(vals)
+                    covered_from[name] = first
+                elif first < covered:
+                    for day_str, vals in daily.items():
+                        if day_str < covered:
+                            repo.days[_parse_day(day_str)] = list(vals)
+                    covered_from[name] = first
+            if self.as_of is not None:
+                self._today = self.as_of.date()
+                self._prune()
+            self._recompute_sums()
+            self.version += 1
+        self.logger.info(f"Leaderboard index built for {len(self._repos)} repos")
+
+    def ingest(self, stats: Iterable[Dict]):
+        """Add one refresh worth of snapshots (each with a 'timestamp')."""
+        with self._lock:
+            for s in stats:
+                self._apply(s)
+            self.version += 1
+
+    def top(self, metric: str, window: str, n: int = 20) -> List[Dict]:
+        """
+        Return the n repos with the largest gain for metric over window.
+        Raises ValueError for unknown metric or window.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        if window not in WINDOWS:
+            raise ValueError(f"Unknown window: {window}")
+        i = METRICS.index(metric)
+        with self._lock:
+            if self._today is None:
+                return []
+            start = self._today - timedelta(days=WINDOWS[window])
+            repos = self._repos
+            candidates = (
+                (name, sums[i]) for name, sums in self._sums[window].items()
+                if repos[name].last_seen.date() > start
+            )
+            best = heapq.nlargest(n, candidates, key=lambda kv: kv[1])
+            return [
+                {
+                    'name': name,
+                    'metric': metric,
+                    'window': window,
+                    'gain': gain,
+                    'value': repos[name].totals[i],
+                }
+                for name, gain in best
+            ]
+
+    def _apply(self, s: Dict):
+        ts = _parse_ts(s['timestamp'])
+        if self.as_of is None or ts > self.as_of:
+            self.as_of = ts
+            today = ts.date()
+            if self._today is not None and today > self._today:
+                if (today - self._today).days < MAX_DAYS:
+                    self._roll_over(today)
+                    self._today = today
+                    self._prune()
+                else:
+                    self._today = today
+                    self._prune()
+                    self._recompute_sums()
+            self._today = today
+        repo = self._repos.get(s['name'])
+        if repo is None:
+            repo = self._repos[s['name']] = _Repo()
+            for w in WINDOWS:
+                self._sums[w][s['name']] = [0] * len(METRICS)
+        elif ts <= repo.last_seen:
+            return
+        repo.last_seen = ts
+        repo.totals = [s[m] for m in METRICS]
+        oldest = self._today - timedelta(days=MAX_DAYS)
+        for day_str, vals in s.get('daily', {}).items():
+            day = _parse_day(day_str)
+            if day <= oldest:
+                continue
+            prev = repo.days.get(day)
+            if prev == vals:
+                continue
+            repo.days[day] = list(vals)
+            self._add(s['name'], day, vals, prev)
+
+    def _add(self, name: str, day: date, vals: list, prev: Optional[list]):
+        for w, span in WINDOWS.items():
+            if day > self._today - timedelta(days=span):
+                sums = self._sums[w][name]
+                for i in range(len(METRICS)):
+                    sums[i] += vals[i] - (prev[i] if prev else 0)
+
+    def _roll_over(self, today: date):
+        """Subtract the buckets that leave each window as the current day advances."""
+        steps = (today - self._today).days
+        for name, repo in self._repos.items():
+            if not repo.days:
+                continue
+            for w, span in WINDOWS.items():
+                sums = self._sums[w][name]
+                for k in range(steps):
+                    leaving = today - timedelta(days=span + k)
+                    if leaving <= self._today - timedelta(days=span):
+                        break
+                    vals = repo.days.get(leaving)
+                    if vals:
+                        for i in range(len(METRICS)):
+                            sums[i] -= vals[i]
+
+    def _prune(self):
+        """Forget buckets older than the largest window and repos not seen within it."""
+        oldest = self._today - timedelta(days=MAX_DAYS)
+        for name in list(self._repos):
+            repo = self._repos[name]
+            for day in [d for d in repo.days if d <= oldest]:
+                del repo.days[day]
+            if repo.last_seen.date() <= oldest:
+                del self._repos[name]
+                for w in WINDOWS:
+                    del self._sums[w][name]
+
+    def _recompute_sums(self):
+        for w, span in WINDOWS.items():
+            start = self._today - timedelta(days=span) if self._today else None
+            sums = self._sums[w] = {}
+            for name, repo in self._repos.items():
+                total = [0] * len(METRICS)
+                for day, vals in repo.days.items():
+                    if day > start:
+                        for i in range(len(METRICS)):
+                            total[i] += vals[i]
+                sums[name] = total
+
+
+# --- Benchmark ---
+def _synthetic_history(repos: int, days: int, refreshes_per_day: int = 1) -> List[Dict]:
+    """Snapshots shaped like GitHubFetcher output: rolling 14-day totals plus daily buckets."""
+    base = datetime(2025, 1, 1)
+    history = []
+    for day in range(days):
+        for r in range(refreshes_per_day):
+            now = base + timedelta(days=day, hours=24 * r / refreshes_per_day)
+            for i in range(repos):
+                daily = {
+                    (now.date() - timedelta(days=k)).isoformat():
+                        [(i * 37 + day - k) % 50, (i * 7 + day - k) % 20,
+                         (i * 13 + day - k) % 9, (i + day - k) % 5]
+                    for k in range(14)
+                }
+                history.append({
+                    'name': f"org/repo-{i}",
+                    'views_count': sum(v[0] for v in daily.values()),
+                    'views_uniques': sum(v[1] for v in daily.values()),
+                    'clones_count': sum(v[2] for v in daily.values()),
+                    'clones_uniques': sum(v[3] for v in daily.values()),
+                    'daily': daily,
+                    'timestamp': now.isoformat(),
+                })
+    return history
+
+
+def benchmark(repos: int = 10000, days: int = 30, n: int = 20) -> Dict[str, float]:
+    """Return ms for build(), one same-day refresh, one next-day refresh, and top(n)."""
+    history = _synthetic_history(repos, days + 1, refreshes_per_day=2)
+    index = LeaderboardIndex()
+    start = time.perf_counter()
+    index.build(history[:-3 * repos])
+    build_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    index.ingest(history[-3 * repos:-2 * repos])
+    ingest_ms = (time.perf_counter() - start) * 1000
+    index.ingest(history[-2 * repos:-repos])
+    start = time.perf_counter()
+    index.ingest(history[-repos:])
+    rollover_ms = (time.perf_counter() - start) * 1000
+    queries = [(m, w) for m in METRICS for w in WINDOWS]
+    start = time.perf_counter()
+    for m, w in queries:
+        index.top(m, w, n)
+    top_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    return {'build_ms': build_ms, 'ingest_ms': ingest_ms,
+            'rollover_ms': rollover_ms, 'top_ms': top_ms}
+
+
+if __name__ == '__main__':
+    import sys
+    repos = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    result = benchmark(repos)
+    print(f"{repos} repos x 30 days: build {result['build_ms']:.0f} ms, "
+          f"refresh {result['ingest_ms']:.0f} ms, day-rollover refresh {result['rollover_ms']:.0f} ms, "
+          f"top-20 {result['top_ms']:.2f} ms")
@@ -0,0 +1,325 @@
+'''src/traffic_monitor/notifier.py
+
+Streaming anomaly detection and batched alerting.
+- AnomalyDetector: O(1) per-repo EWMA mean/variance state, z-score alerts
+- AlertBatcher: de-duplicates alerts (per repo/metric/direction, with cooldown)
+  and delivers each batch to every sink from a background thread
+- Sinks: webhook (Slack-compatible JSON), SMTP email, JSON-lines file
+
+Run `python -m traffic_monitor.notifier` for a throughput benchmark.
+'''
+import os
+import json
+import math
+import time
+import queue
+import smtplib
+import logging
+import threading
+from abc import ABC, abstractmethod
+from email.message import EmailMessage
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import requests
+
+METRICS = ('views_count', 'views_uniques', 'clones_count', 'clones_uniques')
+
+
+class RepoState:
+    """Exponentially weighted mean/variance per metric for one repo."""
+    __slots__ = ('count', 'mean', 'var', 'last')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = [0.0] * len(METRICS)
+        self.var = [0.0] * len(METRICS)
+        self.last: Optional[tuple] = None
+
+
+class AnomalyDetector:
+    """
+    Flags a snapshot metric when it deviates from its EWMA baseline by at least
+    `threshold` standard deviations. Each repo is scored only after `warmup`
+    snapshots. State per repo is constant size; history is never rescanned.
+
+    GitHub only updates its traffic numbers a few times a day, so refreshing more
+    often yields identical snapshots. A snapshot whose metrics equal the repo's
+    last observed ones is skipped; counting it would shrink the variance and
+    turn the next real change into a false alert.
+    """
+    def __init__(self, alpha: float = 0.2, threshold: float = 3.0, warmup: int = 5,
+                 min_delta: int = 5):
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.min_delta = min_delta
+        self.states: Dict[str, RepoState] = {}
+
+    def observe(self, s: Dict) -> List[Dict]:
+        state = self.states.get(s['name'])
+        if state is None:
+            state = self.states[s['name']] = RepoState()
+        values = tuple(s[m] for m in METRICS)
+        if values == state.last:
+            return []
+        state.last = values
+        alerts = []
+        alpha = self.alpha
+        for i, metric in enumerate(METRICS):
+            x = values[i]
+            mean = state.mean[i]
+            if state.count == 0:
+                state.mean[i] = float(x)
+                continue
+            diff = x - mean
+            if state.count >= self.warmup and abs(diff) >= self.min_delta:
+                std = math.sqrt(state.var[i])
+                z = diff / std if std > 0 else math.copysign(math.inf, diff)
+                if abs(z) >= self.threshold:
+                    alerts.append({
+                        'repo': s['name'],
+                        'metric': metric,
+                        'direction': 'spike' if diff > 0 else 'drop',
+                        'value': x,
+                        'expected': round(mean, 2),
+                        'zscore': round(z, 2) if math.isfinite(z) else None,
+                        'timestamp': s.get('timestamp'),
+                    })
+            incr = alpha * diff
+            state.mean[i] = mean + incr
+            state.var[i] = (1 - alpha) * (state.var[i] + diff * incr)
+        state.count += 1
+        return alerts
+
+
+# --- Sinks ---
+class AlertSink(ABC):
+    """Base sink: receives one de-duplicated batch of alerts per flush."""
+    @abstractmethod
+    def send(self, alerts: List[Dict]):
+        """Deliver the batch; raise on failure so the batch is retried."""
+
+
+def _summary(alerts: List[Dict]) -> str:
+    lines = [f"GitHub Traffic Monitor: {len(alerts)} anomal{'y' if len(alerts) == 1 else 'ies'} detected"]
+    for a in alerts:
+        lines.append(
+            f"- {a['repo']}: {a['metric']} {a['direction']} to {a['value']} "
+            f"(expected ~{a['expected']}, z={a['zscore']})"
+        )
+    return "\n".join(lines)
+
+
+class WebhookSink(AlertSink):
+    """POSTs {"text": summary, "alerts": [...]} (Slack incoming-webhook compatible)."""
+    def __init__(self, url: str, timeout: int = 10):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def send(self, alerts: List[Dict]):
+        resp = self.session.post(
+            self.url, json={'text': _summary(alerts), 'alerts': alerts}, timeout=self.timeout
+        )
+        resp.raise_for_status()
+
+
+class SmtpSink(AlertSink):
+    """Sends one email per batch."""
+    def __init__(self, host: str, port: int, sender: str, recipients: List[str],
+                 username: Optional[str] = None, password: Optional[str] = None,
+                 use_tls: bool = True):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = recipients
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+
+    def send(self, alerts: List[Dict]):
+        msg = EmailMessage()
+        msg['Subject'] = f"[traffic-monitor] {len(alerts)} traffic anomalies"
+        msg['From'] = self.sender
+        msg['To'] = ', '.join(self.recipients)
+        msg.set_content(_summary(alerts))
+        with smtplib.SMTP(self.host, self.port, timeout=30) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or '')
+            smtp.send_message(msg)
+
+
+class FileSink(AlertSink):
+    """Appends each alert as a JSON line (handy for tests and log shipping)."""
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def send(self, alerts: List[Dict]):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for a in alerts:
+                f.write(json.dumps(a) + "\n")
+
+
+def build_sinks_from_env() -> List[AlertSink]:
+    """
+    Configure sinks from environment:
+      - TRAFFIC_ALERT_WEBHOOK: webhook URL
+      - TRAFFIC_ALERT_SMTP_HOST / _PORT / _FROM / _TO (comma separated) / _USER / _PASSWORD
+      - TRAFFIC_ALERT_FILE: JSON-lines file path
+    """
+    sinks: List[AlertSink] = []
+    if os.getenv('TRAFFIC_ALERT_WEBHOOK'):
+        sinks.append(WebhookSink(os.environ['TRAFFIC_ALERT_WEBHOOK']))
+    if os.getenv('TRAFFIC_ALERT_SMTP_HOST') and os.getenv('TRAFFIC_ALERT_SMTP_TO'):
+        sinks.append(SmtpSink(
+            host=os.environ['TRAFFIC_ALERT_SMTP_HOST'],
+            port=int(os.getenv('TRAFFIC_ALERT_SMTP_PORT', '587')),
+            sender=os.getenv('TRAFFIC_ALERT_SMTP_FROM', 'traffic-monitor@localhost'),
+            recipients=os.environ['TRAFFIC_ALERT_SMTP_TO'].split(','),
+            username=os.getenv('TRAFFIC_ALERT_SMTP_USER'),
+            password=os.getenv('TRAFFIC_ALERT_SMTP_PASSWORD'),
+        ))
+    if os.getenv('TRAFFIC_ALERT_FILE'):
+        sinks.append(FileSink(os.environ['TRAFFIC_ALERT_FILE']))
+    return sinks
+
+
+class AlertBatcher:
+    """
+    Collects alerts and delivers them to all sinks in one batch per flush.
+    Alerts with the same (repo, metric, direction) are sent at most once per
+    `cooldown` seconds, counted from the first sink that accepts them. If every
+    sink fails, the alerts stay pending and go out with the next flush.
+
+    With background=True (default) batches are handed to a worker thread, so a
+    slow SMTP server or webhook never blocks ingest. Sink failures are logged and
+    never propagate to ingest.
+    """
+    def __init__(self, sinks: List[AlertSink], cooldown: float = 6 * 3600,
+                 background: bool = True):
+        self.sinks = sinks
+        self.cooldown = cooldown
+        self.background = background
+        self._pending: Dict[tuple, Dict] = {}
+        self._in_flight: set = set()
+        self._last_sent: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    def add(self, alerts: Iterable[Dict]):
+        with self._lock:
+            for a in alerts:
+                key = (a['repo'], a['metric'], a['direction'])
+                self._pending[key] = a
+
+    def flush(self) -> List[Dict]:
+        """Queue the due alerts for delivery and return them."""
+        now = time.time()
+        batch = []
+        with self._lock:
+            for key, a in list(self._pending.items()):
+                if key in self._in_flight:
+                    continue  # keep it pending until the earlier batch settles
+                del self._pending[key]
+                if now - self._last_sent.get(key, -math.inf) >= self.cooldown:
+                    batch.append(a)
+                    self._in_flight.add(key)
+        if batch:
+            if self.background:
+                self._ensure_worker()
+                self._queue.put(batch)
+            else:
+                self._deliver(batch)
+        return batch
+
+    def join(self):
+        """Block until every queued batch has been attempted."""
+        self._queue.join()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="alert-dispatch", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = self._queue.get()
+            try:
+                self._deliver(batch)
+            finally:
+                self._queue.task_done()
+
+    def _deliver(self, batch: List[Dict]) -> bool:
+        delivered = not self.sinks
+        for sink in self.sinks:
+            try:
+                sink.send(batch)
+                delivered = True
+            except Exception as e:
+                self.logger.error(f"Alert sink {type(sink).__name__} failed: {e}")
+        now = time.time()
+        with self._lock:
+            for a in batch:
+                key = (a['repo'], a['metric'], a['direction'])
+                self._in_flight.discard(key)
+                if delivered:
+                    self._last_sent[key] = now
+                else:
+                    self._pending.setdefault(key, a)
+        return delivered
+
+
+class AnomalyEngine:
+    """
+    Ingest hook: score each snapshot, then batch, de-duplicate and dispatch alerts.
+    Call prime() once with stored history to warm baselines without alerting.
+    """
+    def __init__(self, detector: AnomalyDetector, batcher: AlertBatcher):
+        self.detector = detector
+        self.batcher = batcher
+        self._lock = threading.Lock()
+
+    def prime(self, history: Iterable[Dict]):
+        with self._lock:
+            for s in history:
+                self.detector.observe(s)
+
+    def ingest(self, stats: Iterable[Dict]) -> List[Dict]:
+        """Score a batch of snapshots; returns the alerts queued for delivery."""
+        with self._lock:
+            for s in stats:
+                self.batcher.add(self.detector.observe(s))
+        return self.batcher.flush()
+
+
+# --- Benchmark ---
+def benchmark(repos: int = 10000, snapshots: int = 20) -> float:
+    """Return snapshots scored per second through AnomalyEngine.ingest (no sinks)."""
+    engine = AnomalyEngine(AnomalyDetector(), AlertBatcher([]))
+    batches = [
+        [{
+            'name': f"org/repo-{i}",
+            'views_count': (i * 37 + day * 11) % 5000,
+            'views_uniques': (i * 7 + day) % 400,
+            'clones_count': (i * 13 + day * 3) % 300,
+            'clones_uniques': (i + day) % 50,
+            'timestamp': f"2025-01-{day % 28 + 1:02d}T00:00:00",
+        } for i in range(repos)]
+        for day in range(snapshots)
+    ]
+    start = time.perf_counter()
+    for batch in batches:
+        engine.ingest(batch)
+    elapsed = time.perf_counter() - start
+    return repos * snapshots / elapsed
+
+
+if __name__ == '__main__':
+    print(f"{benchmark():,.0f} snapshots/sec")